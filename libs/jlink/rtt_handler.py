@@ -8,7 +8,7 @@ from libs.jlink.rtt_handler_interface import RTTHandlerInterface
 class RTTHandler(RTTHandlerInterface):
     def __init__(self, log_processing_input_queue):
         self._jlink = pylink.JLink()
-        self._supported_mcu_list = [self._jlink.supported_device(i).name.upper() for i in range(self._jlink.num_supported_devices())]
+        self._supported_mcu_list = None
         self._log_queue = log_processing_input_queue
         self._connected = False
         self._rtt_thread = None
@@ -113,10 +113,14 @@ class RTTHandler(RTTHandlerInterface):
     def get_supported_mcus(self):
         """
         Get the list of supported MCUs.
+        The J-Link device enumeration is deferred to the first call so it can
+        run off the GUI startup path.
 
         Returns:
             List of MCU strings.
         """
+        if self._supported_mcu_list is None:
+            self._supported_mcu_list = [self._jlink.supported_device(i).name.upper() for i in range(self._jlink.num_supported_devices())]
         return self._supported_mcu_list
 
     @property
@@ -1,4 +1,5 @@
 import datetime
+import re
 import time
 import traceback
 
@@ -37,11 +38,13 @@ def create_log_processor_and_displayer(log_view):
         if not filter_str:
             return unfiltered_content.copy()
 
+        # One compiled case-insensitive scan per line instead of lowering both
+        # the line and the filter string each time; re caches the compiled
+        # pattern across calls with the same filter string
+        pattern = re.compile(re.escape(filter_str), re.IGNORECASE)
         filtered_lines = []
-        filter_str_lower = filter_str.lower()
         for line_tuple in unfiltered_content:
-            line = line_tuple[0]
-            if filter_str_lower in line.lower():
+            if pattern.search(line_tuple[0]):
                 filtered_lines.append(line_tuple)
         return filtered_lines
 
@@ -114,10 +117,12 @@ def create_log_processor_and_displayer(log_view):
         if highlight_string == "":
             return [(line[0], False) for line in text_to_highlight]
         else:
+            # Compiled case-insensitive search, reused across all lines
+            pattern = re.compile(re.escape(highlight_string), re.IGNORECASE)
             highlighted_list = []
             for line in text_to_highlight:
                 line_text = line[0]
-                highlighted = highlight_string.lower() in line_text.lower()
+                highlighted = pattern.search(line_text) is not None
                 highlighted_list.append((line_text, highlighted))
             return highlighted_list
 
@@ -5,6 +5,8 @@ import time
 import queue
 import threading
 import argparse
+import collections
+import itertools
 import matplotlib
 matplotlib.rcParams['font.family'] = 'sans-serif'
 matplotlib.rcParams['font.sans-serif'] = ['Inter', 'Segoe UI', 'Helvetica Neue', 'DejaVu Sans']
@@ -14,7 +16,6 @@ import matplotlib.pyplot as plt
 import numpy as np
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 import libs.log.log_controller as log_controller
-from datetime import datetime
 from libs.jlink.rtt_handler import RTTHandler
 from libs.jlink.demo_rtt_handler import DemoRTTHandler
 from libs.jlink.rtt_handler_interface import RTTHandlerInterface
@@ -24,8 +25,28 @@ from pathlib import Path
 import fnmatch
 import re
 
+# Use orjson for config (de)serialization when available; it is a C-level
+# implementation several times faster than stdlib json. Both paths produce
+# and consume bytes so the file handling is identical.
+try:
+    import orjson
+
+    def _json_dumps(obj):
+        return orjson.dumps(obj)
+
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj):
+        return json.dumps(obj, separators=(',', ':')).encode()
+
+    _json_loads = json.loads
+
 # constants
 LOG_UPDATE_TIME_INTERVAL_ms = 100
+GUI_HEARTBEAT_TIMEOUT_ms = 500
+MCU_FILTER_CACHE_MAX_ENTRIES = 16
+MCU_FILTER_DEBOUNCE_TIME_s = 0.1
+MCU_HISTORY_MAX_ENTRIES = 10
 
 # configure config file path
 APP_NAME = "RTT_GUI"
@@ -38,25 +59,43 @@ class RTTViewer:
     def __init__(self, demo=False):
         self.filter_input_string = ""
         self.highlight_input_string = ""
-        self.last_processed_time = time.time()
+        # Monotonic timestamps for the loop throttles; immune to wall-clock jumps
+        self.last_processed_monotonic = time.monotonic()
         self.log_update_time_interval_s = LOG_UPDATE_TIME_INTERVAL_ms / 1000.0
 
         # Create queues
         self.log_processing_input_queue = queue.Queue()
-        self.display_output_queue = queue.Queue()
+        # Lock-free under the GIL: deque append/popleft are atomic, the event
+        # signals the GUI thread that display data is waiting
+        self.display_output_queue = collections.deque()
+        self._display_wake = threading.Event()
 
         # Initialize RTT Handler
         if demo:
             self._rtt_handler = DemoRTTHandler(self.log_processing_input_queue)
         else:
             self._rtt_handler = RTTHandler(self.log_processing_input_queue)
-        self.supported_mcu_list = self._rtt_handler.get_supported_mcus()
+        # Supported MCUs are loaded on a background thread after the window is
+        # up, so device enumeration does not delay the first paint
+        self.supported_mcu_list = ()
+        self._supported_mcu_set = frozenset()
+        self._supported_mcu_upper = ()
+        self._mcu_filter_cache = {"": range(0)}
         # Load configuration
         self._config_file_path = os.path.join(config_file_dir, CONFIG_FILE_NAME)
         config = self._load_config()
-        self.mcu_history = config.get('mcu_history', [])
+        # Bounded deque: O(1) appendleft with no reslicing on overflow
+        self.mcu_history = collections.deque(config.get('mcu_history', []), maxlen=MCU_HISTORY_MAX_ENTRIES)
+        # Cached combo values; invalidated whenever the MCU history changes
+        self._combo_cache = None
         self.last_interface = config.get('last_interface', 'SWD')
         self.data_series = config.get('data_series', [])
+        # Config writes happen on a background thread so filesystem stalls
+        # never block the GUI thread; the single-slot queue coalesces bursts
+        self._config_write_queue = queue.Queue(maxsize=1)
+        self._last_saved_blob = None
+        self._config_writer_thread = threading.Thread(target=self._config_writer_loop, daemon=True)
+        self._config_writer_thread.start()
         # Initialize MCU combo values with history
         # GUI setup
         # Modern dark color palette
@@ -172,11 +211,12 @@ class RTTViewer:
 
         # Set initial MCU selection to the most recently used MCU if available
         if demo:
-            self._window['-MCU-'].update(value='DEMO_MCU')
+            self.current_mcu = 'DEMO_MCU'
         elif self.mcu_history:
-            self._window['-MCU-'].update(value=self.mcu_history[0])
+            self.current_mcu = self.mcu_history[0]
         else:
-            self._window['-MCU-'].update(value='STM32F427II')
+            self.current_mcu = 'STM32F427II'
+        self._window['-MCU-'].update(value=self.current_mcu)
 
         # Set minimum size
         self._window.set_min_size((800, 600))
@@ -184,9 +224,20 @@ class RTTViewer:
         # Initialize GUI state
         self._update_gui_status(False)
 
+        # Load supported MCUs in the background and refresh the combo once done
+        self._mcu_load_thread = threading.Thread(target=self._load_supported_mcus, daemon=True)
+        self._mcu_load_thread.start()
+
         self.mcu_filter_string = ''
         self.last_mcu_filter_string = ""
-        self.mcu_list_last_update_time = time.time()
+        self.mcu_list_last_update_monotonic = time.monotonic()
+        # Debounce state for the MCU filter: keystrokes only record the newest
+        # string here, run() applies it once per settled burst
+        self._pending_mcu_filter = ''
+        self._last_applied_mcu_filter = ''
+        self._mcu_filter_deadline = 0.0
+        # Values last pushed into the combo; equal results skip the Tk rebuild
+        self._last_filtered = None
 
         # Bind the <KeyRelease> event to the Combo widget
         self._window['-MCU-'].Widget.bind("<KeyPress>", lambda event: self._window.write_event_value('-MCU-KEYRELEASE-', event))
@@ -238,103 +289,201 @@ class RTTViewer:
 
     def _log_processing_thread(self):
         while True:
-            try:
-                # Get element from input queue
-                log_input = self.log_processing_input_queue.get(timeout=0.1)
+            # Block until a producer enqueues something instead of polling;
+            # run() sends a None sentinel to request shutdown
+            log_input = self.log_processing_input_queue.get()
+            if log_input is None:
+                break
 
-                # Parse log processing item
-                line = log_input["line"] if "line" in log_input else ""
-                filter_string = log_input["filter_string"] if "filter_string" in log_input else None
-                highlight_string = log_input["highlight_string"] if "highlight_string" in log_input else None
-                pause_string = log_input["pause_string"] if "pause_string" in log_input else None
+            # Parse log processing item
+            line = log_input.get("line", "")
+            filter_string = log_input.get("filter_string")
+            highlight_string = log_input.get("highlight_string")
+            pause_string = log_input.get("pause_string")
 
-                # Extract plot data
-                if line and self.active_series_names:
-                    self._extract_plot_data(line)
+            # Extract plot data
+            if line and self.active_series_names:
+                self._extract_plot_data(line)
 
-                # Invoke processing
-                update_info = self.log_handler["process"](line, filter_string, highlight_string, pause_string)
+            # Invoke processing
+            update_info = self.log_handler["process"](line, filter_string, highlight_string, pause_string)
 
-                # Add processing result to output queue
-                self.display_output_queue.put(update_info)
-            except queue.Empty:
-                pass
-            time.sleep(0.01)
+            # Add processing result to output queue; post a wake event to the
+            # GUI only once per drain cycle to avoid event flooding
+            self.display_output_queue.append(update_info)
+            if not self._display_wake.is_set():
+                self._display_wake.set()
+                self._window.write_event_value('-LOG-READY-', None)
 
     def _process_display_output_queue(self):
-        count = 0
-        max_per_call = 20  # Limit to 100 lines per GUI update to prevent overload
-        highlighted_log_lines = []
-        update_info = []
-        while not self.display_output_queue.empty() and count < max_per_call:
-            try:
-                update_info = self.display_output_queue.get_nowait()
-                highlighted_log_lines += update_info['highlighted_text_list']
-                count += 1
-                if update_info["append"] == False:
-                    break
-            except queue.Empty:
+        max_per_call = 20  # Limit updates per GUI tick to prevent overload
+        self._display_wake.clear()
+        update_infos = []
+        try:
+            for _ in range(max_per_call):
+                update_infos.append(self.display_output_queue.popleft())
+        except IndexError:
+            pass
+        if self.display_output_queue:
+            # Partial drain left frames behind; keep the flag set so the next
+            # tick drains the remainder even if no new line ever arrives
+            self._display_wake.set()
+        if not update_infos:
+            return
+        # A non-append frame restarts the log display, so frames before the
+        # last one are superseded
+        for index in range(len(update_infos) - 1, -1, -1):
+            if update_infos[index]["append"] == False:
+                update_infos = update_infos[index:]
                 break
-        if update_info != []:
-            # print processed lines
-            #highlighted_log_lines.append((f"count on print: {count}", False))
-            update_info['highlighted_text_list'] = highlighted_log_lines
-            self.log_view.display_log_update(update_info)
+        # Drop no-op append frames: a frame without lines only matters when it
+        # resets the display
+        update_infos = [info for info in update_infos
+                        if info['highlighted_text_list'] or info["append"] == False]
+        if not update_infos:
+            return
+        update_info = update_infos[-1]
+        if len(update_infos) > 1:
+            # Merge into one shared flattened list instead of copying per frame
+            update_info['highlighted_text_list'] = list(itertools.chain.from_iterable(
+                info['highlighted_text_list'] for info in update_infos))
+            # The merged batch resets the display if its first frame did;
+            # taking the flag from the last frame would append the reset
+            # frame's full re-render after the stale content
+            update_info['append'] = update_infos[0]['append']
+        self.log_view.display_log_update(update_info)
         #else:
         #    # call log gui update at least once per second
         #    if (datetime.now() - log_controller.get_last_log_gui_filter_update_date()).total_seconds() > log_controller.GUI_MINIMUM_REFRESH_INTERVAL_s:
         #        update_info = self.log_handler["process"]("")
         #        self.log_view.display_log_update(update_info)
 
+    def _load_supported_mcus(self):
+        try:
+            supported_mcus = tuple(self._rtt_handler.get_supported_mcus())
+        except Exception as e:
+            # Enumeration failed (e.g. J-Link DLL missing); surface the error
+            # instead of leaving the combo stuck on 'Loading...'
+            self._window.write_event_value('-MCUS-LOAD-FAILED-', str(e))
+            return
+        self.supported_mcu_list = supported_mcus
+        self._supported_mcu_set = frozenset(supported_mcus)
+        # Parallel tuple of uppercase names; the filter scans this and maps the
+        # surviving indices back to the original names
+        self._supported_mcu_upper = tuple(mcu.upper() for mcu in supported_mcus)
+        self._mcu_filter_cache = {"": range(len(supported_mcus))}
+        self._window.write_event_value('-MCUS-LOADED-', supported_mcus)
+
     def _filter_mcu_list(self, filter_string):
         input_text = filter_string.upper()
-        filtered = [mcu for mcu in self.supported_mcu_list if input_text in mcu]
-        self._window['-MCU-'].update(values=filtered)
+        indices = self._mcu_filter_cache.get(input_text)
+        if indices is None:
+            # Reuse the longest cached result whose filter string is contained in
+            # the new one: its matches are a superset of the new matches, so only
+            # that subset needs rescanning instead of the full MCU list
+            base = self._mcu_filter_cache[""]
+            best_length = 0
+            for cached_text, cached_indices in self._mcu_filter_cache.items():
+                if cached_text and cached_text in input_text and len(cached_text) > best_length:
+                    base = cached_indices
+                    best_length = len(cached_text)
+            upper = self._supported_mcu_upper
+            indices = [index for index in base if input_text in upper[index]]
+            self._mcu_filter_cache[input_text] = indices
+            while len(self._mcu_filter_cache) > MCU_FILTER_CACHE_MAX_ENTRIES:
+                oldest = next(key for key in self._mcu_filter_cache if key != "")
+                del self._mcu_filter_cache[oldest]
+        else:
+            # Refresh the entry's LRU position
+            self._mcu_filter_cache[input_text] = self._mcu_filter_cache.pop(input_text)
+        mcus = self.supported_mcu_list
+        filtered = tuple(mcus[index] for index in indices)
+        if filtered == self._last_filtered:
+            # Same matches as currently shown; rebuilding the Tk listbox is the
+            # expensive part, so skip it
+            return
+        self._last_filtered = filtered
+        self._window['-MCU-'].update(values=list(filtered))
 
     def _load_config(self):
         try:
-            with open(self._config_file_path, 'r') as f:
-                data = json.load(f)
+            with open(self._config_file_path, 'rb') as f:
+                data = _json_loads(f.read())
                 if isinstance(data, dict):
                     return data
         except Exception:
             pass
         return {'mcu_history': [], 'last_interface': 'SWD'}
 
-    def _save_config(self):
+    def _config_writer_loop(self):
+        while True:
+            blob = self._config_write_queue.get()
+            if blob is None:
+                # Shutdown sentinel from run(); pending writes are done
+                break
+            if not self._atomic_write_config(blob):
+                # A failed write must not suppress retrying the same state
+                self._last_saved_blob = None
+
+    def _atomic_write_config(self, blob):
         try:
-            config = {
-                'mcu_history': self.mcu_history,
-                'last_interface': self.last_interface,
-                'data_series': self.data_series
-            }
-            with open(self._config_file_path, 'w') as f:
-                json.dump(config, f)
+            tmp_path = self._config_file_path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(blob)
+            os.replace(tmp_path, self._config_file_path)
+            return True
         except Exception:
-            pass
+            return False
+
+    def _save_config(self):
+        config = {
+            'mcu_history': list(self.mcu_history),
+            'last_interface': self.last_interface,
+            'data_series': list(self.data_series)
+        }
+        # Skip the disk write entirely when nothing changed since the last save
+        blob = _json_dumps(config)
+        if blob == self._last_saved_blob:
+            return
+        self._last_saved_blob = blob
+        try:
+            self._config_write_queue.put_nowait(blob)
+        except queue.Full:
+            # Replace the still-pending write; this state supersedes it
+            try:
+                self._config_write_queue.get_nowait()
+            except queue.Empty:
+                pass
+            self._config_write_queue.put_nowait(blob)
 
     def _build_mcu_combo_values(self):
-        combo = []
-        if self.mcu_history:
-            combo.append('--- Last used ---')
-            combo.extend(self.mcu_history)
-        combo.append('--- All ---')
-        combo.extend(self.supported_mcu_list)
-        return combo
+        if self._combo_cache is None:
+            combo = []
+            if self.mcu_history:
+                combo.append('--- Last used ---')
+                combo.extend(self.mcu_history)
+            combo.append('--- All ---')
+            if self.supported_mcu_list:
+                combo.extend(self.supported_mcu_list)
+            else:
+                combo.append('Loading...')
+            self._combo_cache = combo
+        return self._combo_cache
 
     def _update_mcu_combo(self):
         selected_mcu = self._window['-MCU-'].get()
         self._window['-MCU-'].update(values=self._build_mcu_combo_values())
         self._window['-MCU-'].update(value=selected_mcu)
+        self._last_filtered = None
 
     def _update_mcu_history(self, mcu):
-        if mcu in self.supported_mcu_list:
+        if mcu in self._supported_mcu_set:
             if mcu in self.mcu_history:
                 pass
                 #self.mcu_history.remove(mcu)
             else:
-                self.mcu_history.insert(0, mcu)
-            self.mcu_history = self.mcu_history[:10]
+                self.mcu_history.appendleft(mcu)
+            self._combo_cache = None
             self._save_config()
             self._update_mcu_combo()
 
@@ -709,14 +858,24 @@ class RTTViewer:
             retVal = False
         elif event == '-MCU-':
             selected = values['-MCU-']
-            if selected in self.supported_mcu_list:
+            if selected in self._supported_mcu_set:
                 self.current_mcu = selected
                 self.mcu_filter_string = ""
+                self._pending_mcu_filter = ""
+                self._last_applied_mcu_filter = ""
             else:
-                self._window['-MCU-'].update(value=self.current_mcu if hasattr(self, 'current_mcu') else '')
+                self._window['-MCU-'].update(value=self.current_mcu)
+        elif event == '-MCUS-LOADED-':
+            # Background MCU load finished; rebuild the combo with the full list
+            self._combo_cache = None
+            self._update_mcu_combo()
+        elif event == '-MCUS-LOAD-FAILED-':
+            sg.popup_error(f'Failed to load supported MCUs: {values[event]}')
         elif event == '-MCU-KEYRELEASE-':
             self.mcu_filter_string = values['-MCU-']
-            self.mcu_list_last_update_time = time.time()
+            self._pending_mcu_filter = self.mcu_filter_string
+            self._mcu_filter_deadline = time.monotonic() + MCU_FILTER_DEBOUNCE_TIME_s
+            self.mcu_list_last_update_monotonic = time.monotonic()
         elif event == '-CONNECT-':
             try:
                 selected_mcu = self._window['-MCU-'].get()
@@ -749,9 +908,10 @@ class RTTViewer:
                 try:
                     # Retrieve raw log lines from the log_controller module
                     raw_lines = getattr(log_controller, 'old_raw_log_lines', [])
-                    with open(save_path, 'w', encoding='utf-8') as f:
-                        for line, _ in raw_lines:
-                            f.write(line + '\n')
+                    # Stream via writelines with a large buffer instead of one
+                    # write-plus-concatenation per line
+                    with open(save_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                        f.writelines(f"{line}\n" for line, _ in raw_lines)
                 except Exception as e:
                     sg.popup_error(f'Failed to save log: {e}')
         elif event == '-FILTER-':
@@ -960,11 +1120,13 @@ class RTTViewer:
 
         try:
             # GUI event loop
+            read_timeout_ms = GUI_HEARTBEAT_TIMEOUT_ms
             while True:
                 #time.sleep(0.1)
 
-                # Check events
-                event, values = self._window.read(timeout=100)
+                # Check events; -LOG-READY- wakes the read when display data
+                # arrives, the timeout is only a safety heartbeat
+                event, values = self._window.read(timeout=read_timeout_ms)
                 if self.handle_events(event, values) == False:
                     break
 
@@ -974,21 +1136,25 @@ class RTTViewer:
                     self.highlight_input_string,
                     self.mcu_filter_string
                 )
-                if "mcu_string" in input_update:
-                    # Check MCU filter
-                    applied_mcu_filter_string = input_update["mcu_string"]
-                    if applied_mcu_filter_string:
-                        self._filter_mcu_list(applied_mcu_filter_string)
+                # MCU filtering is debounced here instead of going through the
+                # widget apply-delay round-trip
+                input_update.pop("mcu_string", None)
+                if (self._pending_mcu_filter != self._last_applied_mcu_filter
+                        and time.monotonic() >= self._mcu_filter_deadline):
+                    self._last_applied_mcu_filter = self._pending_mcu_filter
+                    if self._pending_mcu_filter:
+                        self._filter_mcu_list(self._pending_mcu_filter)
 
                 # Handle log processing on input changes
                 if input_update != {}:
                     self.log_processing_input_queue.put(input_update)
 
                 # Update log
-                current_time = time.time()
-                if current_time - self.last_processed_time >= self.log_update_time_interval_s:
-                    self._process_display_output_queue()
-                    self.last_processed_time = current_time
+                current_time = time.monotonic()
+                if current_time - self.last_processed_monotonic >= self.log_update_time_interval_s:
+                    if self._display_wake.is_set():
+                        self._process_display_output_queue()
+                    self.last_processed_monotonic = current_time
 
                     # Update series values view if a series is selected
                     if self.selected_series_for_view:
@@ -1006,7 +1172,23 @@ class RTTViewer:
                                     self._update_plot()
                                     break
 
+                # Display data still pending (wake arrived inside the throttle
+                # window, or a partial drain left frames queued): wake again
+                # once the remaining throttle interval elapses instead of
+                # waiting for the full heartbeat. The producer only posts one
+                # -LOG-READY- per drain cycle, so nothing else would wake us.
+                if self._display_wake.is_set():
+                    remaining_s = self.log_update_time_interval_s - (time.monotonic() - self.last_processed_monotonic)
+                    read_timeout_ms = min(GUI_HEARTBEAT_TIMEOUT_ms, max(int(remaining_s * 1000), 0))
+                else:
+                    read_timeout_ms = GUI_HEARTBEAT_TIMEOUT_ms
+
         finally:
+            # Unblock the log processing thread so it can exit
+            self.log_processing_input_queue.put(None)
+            # Flush any pending config write before the daemon writer is killed
+            self._config_write_queue.put(None)
+            self._config_writer_thread.join(timeout=2)
             if self.plot_fig:
                 plt.close(self.plot_fig)
             self._rtt_handler.disconnect()
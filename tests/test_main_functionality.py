@@ -38,7 +38,10 @@ class TestRTTViewer:
     def test_demo_mode_initialization(self):
         """Test that demo mode initializes correctly"""
         viewer_demo = RTTViewer(demo=True)
-        
+
+        # Wait for the background MCU load to finish
+        viewer_demo._mcu_load_thread.join()
+
         # Check that DEMO_MCU is in supported MCUs
         assert 'DEMO_MCU' in viewer_demo.supported_mcu_list
         
@@ -48,14 +51,20 @@ class TestRTTViewer:
     def test_normal_mode_initialization(self):
         """Test that normal mode initializes correctly"""
         viewer_normal = RTTViewer(demo=False)
-        
+
+        # Wait for the background MCU load to finish
+        viewer_normal._mcu_load_thread.join()
+
         # Check that normal mode has the expected MCU list
         assert len(viewer_normal.supported_mcu_list) > 0
     
     def test_mcu_selection(self):
         """Test MCU selection functionality"""
         viewer = RTTViewer(demo=True)
-        
+
+        # Wait for the background MCU load to finish
+        viewer._mcu_load_thread.join()
+
         # Test that we can access the supported MCUs list
         assert len(viewer.supported_mcu_list) > 0
 
@@ -66,14 +75,20 @@ class TestRTTViewerIntegration:
     def test_demo_mode_functionality(self):
         """Test demo mode specific functionality"""
         viewer_demo = RTTViewer(demo=True)
-        
+
+        # Wait for the background MCU load to finish
+        viewer_demo._mcu_load_thread.join()
+
         # Verify DEMO_MCU is in supported MCUs
         assert 'DEMO_MCU' in viewer_demo.supported_mcu_list
     
     def test_normal_mode_functionality(self):
         """Test normal mode specific functionality"""
         viewer_normal = RTTViewer(demo=False)
-        
+
+        # Wait for the background MCU load to finish
+        viewer_normal._mcu_load_thread.join()
+
         # Verify STM32F427II is in supported MCUs
         assert 'STM32F427II' in viewer_normal.supported_mcu_list
 